@@ -1,15 +1,66 @@
+import io
+import os
+import tempfile
+import numpy as np
 import pandas as pd
 import streamlit as st
+from pyarrow import csv as pacsv
+import pyarrow.parquet as pq
 import matplotlib.pyplot as plt
 import seaborn as sns
-from sklearn.cluster import KMeans
-from sklearn.preprocessing import StandardScaler
+from numba import njit
 
 st.set_page_config(page_title="WHO Physical Activity — EDA", layout="wide")
 
+# Легші налаштування рендерингу matplotlib задаємо один раз для всіх графіків
+plt.rcParams.update({
+    "figure.autolayout": True,
+    "path.simplify": True,
+    "path.simplify_threshold": 1.0,
+    "agg.path.chunksize": 10000,
+})
+
+DATA_PATH = "data/insufficient_activity.csv"
+PARQUET_PATH = "data/insufficient_activity.parquet"
+COLUMNS = ["Period", "Dim1", "Location", "FactValueNumeric", "ParentLocation"]
+
+@st.cache_resource
+def ensure_parquet(csv_path: str, parquet_path: str) -> str:
+    # Одноразова конвертація CSV -> Parquet; перегенеровуємо, якщо CSV новіший
+    if not os.path.exists(parquet_path) or os.path.getmtime(parquet_path) < os.path.getmtime(csv_path):
+        table = pacsv.read_csv(csv_path, read_options=pacsv.ReadOptions(use_threads=True))
+        # Пишемо в тимчасовий файл поруч і атомарно підміняємо, щоб обірваний запис
+        # не залишив обрізаний Parquet, новіший за CSV
+        fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(parquet_path) or ".", suffix=".parquet")
+        os.close(fd)
+        try:
+            pq.write_table(table, tmp_path, compression="zstd", row_group_size=64_000)
+            os.replace(tmp_path, parquet_path)
+        except BaseException:
+            os.remove(tmp_path)
+            raise
+    return parquet_path
+
 @st.cache_data
 def load_data(path: str) -> pd.DataFrame:
-    return pd.read_csv(path)
+    # Parquet колонковий: читаємо лише потрібні колонки, без парсингу float з тексту
+    df = pd.read_parquet(path, columns=COLUMNS, engine="pyarrow")
+    # Вужчі типи -> менше байтів на кожен скан: int16 для року, category для рядків.
+    # FactValueNumeric лишаємо float64 — це точне значення для показу; скани йдуть по
+    # float32-колонці sufficient_activity нижче
+    df = df.astype({
+        "Period": "int16",
+        "FactValueNumeric": "float64",
+        "Dim1": "category",
+        "ParentLocation": "category",
+        "Location": "category",
+    })
+    # Рахуємо sufficient activity один раз; float32 вдвічі зменшує обсяг даних для сканів
+    df["sufficient_activity"] = np.subtract(100.0, df["FactValueNumeric"].to_numpy(), dtype=np.float32)
+    # Відсортований MultiIndex: .loc[(year, sex)] замість повного скану булевою маскою.
+    # Стабільне сортування зберігає порядок рядків з файлу всередині кожного (year, sex)
+    df = df.sort_values(["Period", "Dim1"], kind="stable")
+    return df.set_index(["Period", "Dim1"])
 
 st.title("WHO Physical Activity (Insufficient Activity) — Global EDA")
 st.markdown(
@@ -17,8 +68,229 @@ st.markdown(
     "Use the filters to compare years and genders across countries."
 )
 
-DATA_PATH = "data/insufficient_activity.csv"
-df_raw = load_data(DATA_PATH)
+df_raw = load_data(ensure_parquet(DATA_PATH, PARQUET_PATH))
+
+# Кешовані похідні таблиці: перерахунок лише при зміні відповідних фільтрів
+@st.cache_data
+def year_options() -> tuple:
+    # Роки для selectbox рахуємо один раз: рівень індексу вже відсортований
+    return tuple(df_raw.index.get_level_values("Period").unique())
+
+@st.cache_data
+def snapshot(year: int, sex: str) -> pd.DataFrame:
+    df = (
+        df_raw.loc[(year, sex), ["Location", "FactValueNumeric", "sufficient_activity"]]
+        .reset_index(drop=True)
+        .rename(columns={"Location": "country", "FactValueNumeric": "insufficient_activity"})
+        .dropna(subset=["insufficient_activity"])
+    )
+    return df
+
+@st.cache_data
+def country_index(year: int, sex: str) -> dict[str, int]:
+    # country -> позиція рядка у snapshot, щоб вибір країни був iloc, а не маскою
+    return {c: i for i, c in enumerate(snapshot(year, sex)["country"])}
+
+@st.cache_data
+def country_options(year: int, sex: str) -> tuple:
+    # Лише країни, присутні в цьому snapshot; сортуємо один раз на (year, sex)
+    return tuple(sorted(country_index(year, sex)))
+
+@st.cache_data
+def sex_trends() -> dict[str, tuple[np.ndarray, np.ndarray]]:
+    # Тренд залежить лише від статі: один groupby для всіх значень Dim1 -> {sex: (years, avg)}
+    avg = df_raw.groupby(level=["Dim1", "Period"], observed=True)["sufficient_activity"].mean().dropna()
+    return {
+        sex: (s.index.get_level_values("Period").to_numpy(), s.to_numpy())
+        for sex, s in avg.groupby(level="Dim1", observed=True)
+    }
+
+def segment_means(keys: np.ndarray, values: np.ndarray, n_keys: int) -> np.ndarray:
+    # Середнє по групах для ключів 0..n_keys-1 без groupby: np.add.reduceat.
+    # Як і groupby().mean(), пропускаємо рядки без групи (код -1) та NaN-значення
+    m = (keys >= 0) & np.isfinite(values)
+    keys, values = keys[m], values[m]
+    # reduceat потребує суцільних груп: стабільно сортуємо ключі (їх лише ~200 на рік)
+    order = np.argsort(keys, kind="stable")
+    keys, values = keys[order], values[order]
+    means = np.full(n_keys, np.nan)
+    if len(values) == 0:
+        return means
+    # reduceat отримує лише початки непорожніх груп, а суми розкладаємо назад за ключем
+    starts = np.flatnonzero(np.r_[True, keys[1:] != keys[:-1]])
+    sums = np.add.reduceat(values, starts, dtype=np.float64)
+    counts = np.diff(np.r_[starts, len(values)])
+    means[keys[starts]] = sums / counts
+    return means
+
+@st.cache_data
+def region_means(year: int) -> pd.DataFrame:
+    df_year = df_raw.loc[(year, "Both sexes")]
+    regions = df_year["ParentLocation"].cat.categories
+    codes = df_year["ParentLocation"].cat.codes.to_numpy()
+    means = segment_means(codes, df_year["sufficient_activity"].to_numpy(), len(regions))
+    df_region = pd.DataFrame({"region": regions, "avg_sufficient_activity": means})
+    return df_region.dropna().reset_index(drop=True)
+
+def region_year_pivot() -> tuple[np.ndarray, pd.Index, pd.Index]:
+    # Матриця region × year напряму через np.add.at, без проміжного pivot-фрейму
+    rcodes, regions = pd.factorize(df_raw["ParentLocation"], sort=True)
+    ycodes, years = pd.factorize(df_raw.index.get_level_values("Period"), sort=True)
+    vals = df_raw["sufficient_activity"].to_numpy()
+    # беремо Both sexes для стабільності порівняння; NaN пропускаємо, як mean()
+    m = (df_raw.index.get_level_values("Dim1") == "Both sexes") & (rcodes >= 0) & ~np.isnan(vals)
+    sums = np.zeros((len(regions), len(years)), np.float64)
+    counts = np.zeros_like(sums)
+    np.add.at(sums, (rcodes[m], ycodes[m]), vals[m])
+    np.add.at(counts, (rcodes[m], ycodes[m]), 1)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        return sums / counts, pd.Index(regions), pd.Index(years)
+
+@njit(cache=True)
+def kmeans1d(x, k):
+    # Точний 1-D k-means: після сортування кластери — суцільні відрізки, тож оптимальне
+    # розбиття знаходимо динамічним програмуванням за O(k·n²) без випадкової ініціалізації
+    n = x.shape[0]
+    order = np.argsort(x)
+    xs = x[order]
+    s1 = np.zeros(n + 1)
+    s2 = np.zeros(n + 1)
+    for i in range(n):
+        s1[i + 1] = s1[i] + xs[i]
+        s2[i + 1] = s2[i] + xs[i] * xs[i]
+    # cost[m, j] — мінімальна інерція перших j точок у m кластерах; split — де почався останній
+    cost = np.full((k + 1, n + 1), np.inf)
+    split = np.zeros((k + 1, n + 1), np.int64)
+    cost[0, 0] = 0.0
+    for m in range(1, k + 1):
+        for j in range(m, n + 1):
+            for i in range(m - 1, j):
+                seg_sum = s1[j] - s1[i]
+                seg_cost = (s2[j] - s2[i]) - seg_sum * seg_sum / (j - i)
+                c = cost[m - 1, i] + seg_cost
+                if c < cost[m, j]:
+                    cost[m, j] = c
+                    split[m, j] = i
+    labels_sorted = np.empty(n, np.int64)
+    centers = np.empty(k)
+    j = n
+    for m in range(k, 0, -1):
+        i = split[m, j]
+        labels_sorted[i:j] = m - 1
+        centers[m - 1] = (s1[j] - s1[i]) / (j - i)
+        j = i
+    # Кластери вже занумеровані за зростанням центру
+    labels = np.empty(n, np.int64)
+    labels[order] = labels_sorted
+    return labels, centers
+
+@st.cache_resource
+def fit_kmeans(vals_bytes: bytes, k: int) -> tuple[np.ndarray, np.ndarray]:
+    # Сирі байти масиву хешуються швидко; модель не перенавчається,
+    # коли змінюється лише вибір кластера нижче.
+    # Масштабування не потрібне: для однієї ознаки воно не змінює розбиття
+    x = np.frombuffer(vals_bytes, dtype=np.float32).astype(np.float64)
+    return kmeans1d(x, k)
+
+@st.cache_data
+def cluster_labels(year: int, sex: str, k: int) -> np.ndarray:
+    # Мітки окремим масивом, вирівняним з snapshot(year, sex).index — сам snapshot не змінюємо
+    vals_bytes = snapshot(year, sex)["sufficient_activity"].to_numpy().tobytes()
+    labels, _ = fit_kmeans(vals_bytes, k)
+    return labels.astype(np.int8)
+
+def top_bottom(df: pd.DataFrame, n: int, col: str = "sufficient_activity") -> tuple[pd.DataFrame, pd.DataFrame]:
+    # Часткова вибірка O(n) через argpartition замість nlargest/nsmallest
+    vals = df[col].to_numpy()
+    n = min(n, len(vals))
+    if n < len(vals):
+        idx_top = np.argpartition(-vals, n)[:n]
+        idx_bottom = np.argpartition(vals, n)[:n]
+    else:
+        idx_top = idx_bottom = np.arange(len(vals))
+    idx_top = idx_top[np.argsort(-vals[idx_top], kind="stable")]
+    idx_bottom = idx_bottom[np.argsort(vals[idx_bottom], kind="stable")]
+    return df.iloc[idx_top], df.iloc[idx_bottom]
+
+# Графіки кешуємо як PNG-байти: при rerun перемальовуються лише ті, чиї дані змінились
+def fig_to_png(fig) -> bytes:
+    buf = io.BytesIO()
+    fig.savefig(buf, format="png", dpi=200, bbox_inches="tight")
+    plt.close(fig)
+    return buf.getvalue()
+
+@st.cache_data
+def trend_png(sex: str) -> bytes:
+    yrs, avg_suf = sex_trends()[sex]
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.plot(yrs, avg_suf, marker="o")
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Avg sufficient physical activity (%)")
+    ax.set_title("Global trend in physical activity over time")
+    return fig_to_png(fig)
+
+@st.cache_data
+def hist_png(vals_bytes: bytes) -> bytes:
+    vals = np.frombuffer(vals_bytes, dtype=np.float32)
+    fig, ax = plt.subplots(figsize=(8, 5))
+    ax.hist(vals, bins=20)
+    ax.set_xlabel("Sufficient physical activity (%)")
+    ax.set_ylabel("Number of countries")
+    ax.set_title("Histogram")
+    return fig_to_png(fig)
+
+@st.cache_data
+def boxplot_png(vals_bytes: bytes) -> bytes:
+    vals = np.frombuffer(vals_bytes, dtype=np.float32)
+    fig, ax = plt.subplots(figsize=(8, 3))
+    sns.boxplot(x=vals, ax=ax)
+    ax.set_xlabel("Sufficient physical activity (%)")
+    ax.set_title("Boxplot")
+    return fig_to_png(fig)
+
+@st.cache_data
+def stripplot_png(labels_bytes: bytes, vals_bytes: bytes) -> bytes:
+    labels = np.frombuffer(labels_bytes, dtype=np.int8)
+    vals = np.frombuffer(vals_bytes, dtype=np.float32)
+    # Звичайний scatter з jitter по x замість sns.stripplot
+    x = labels + np.random.default_rng(42).uniform(-0.25, 0.25, len(labels))
+    fig, ax = plt.subplots(figsize=(10, 4))
+    ax.scatter(x, vals, s=15, alpha=0.7)
+    clusters = np.unique(labels)
+    ax.set_xticks(clusters)
+    ax.set_xticklabels(clusters)
+    ax.set_xlabel("Cluster")
+    ax.set_ylabel("Sufficient physical activity (%)")
+    ax.set_title("Clusters of countries by physical activity level")
+    return fig_to_png(fig)
+
+@st.cache_data
+def heatmap_png() -> bytes:
+    # Heatmap залежить лише від df_raw, а не від фільтрів: без аргументів вона рахується
+    # і малюється один раз за життя даних; окремо кешувати pivot не потрібно
+    pivot, regions, heat_years = region_year_pivot()
+    # imshow малює одне растрове зображення замість окремого патча на кожну клітинку
+    fig, ax = plt.subplots(figsize=(12, 4))
+    im = ax.imshow(pivot, aspect="auto", interpolation="none", cmap="rocket")
+    ax.set_xticks(range(len(heat_years)))
+    ax.set_xticklabels(heat_years, rotation=90)
+    ax.set_yticks(range(len(regions)))
+    ax.set_yticklabels(regions)
+    fig.colorbar(im, ax=ax)
+    ax.set_xlabel("Year")
+    ax.set_ylabel("Region")
+    ax.set_title("Average sufficient physical activity (%) by region and year")
+    return fig_to_png(fig)
+
+@st.cache_data
+def region_bar_png(year: int) -> bytes:
+    df_region = region_means(year)
+    fig, ax = plt.subplots(figsize=(8, 5))
+    sns.barplot(data=df_region, x="avg_sufficient_activity", y="region", ax=ax)
+    ax.set_xlabel("Avg sufficient activity (%)")
+    ax.set_ylabel("Region")
+    ax.set_title("Average sufficient activity by region")
+    return fig_to_png(fig)
 
 # Sidebar filters
 st.sidebar.markdown(
@@ -26,21 +298,14 @@ st.sidebar.markdown(
     "change across years and between genders."
 )
 
-years = sorted(df_raw["Period"].dropna().unique())
+years = year_options()
 default_year = 2019 if 2019 in years else years[-1]
 year = st.sidebar.selectbox("Year", years, index=years.index(default_year))
 
 sex_options = ["Both sexes", "Female", "Male"]
 sex = st.sidebar.selectbox("Sex", sex_options, index=0)
 
-df = (
-    df_raw[(df_raw["Period"] == year) & (df_raw["Dim1"] == sex)]
-    .loc[:, ["Location", "FactValueNumeric"]]
-    .rename(columns={"Location": "country", "FactValueNumeric": "insufficient_activity"})
-    .dropna(subset=["insufficient_activity"])
-)
-
-df["sufficient_activity"] = 100 - df["insufficient_activity"]
+df = snapshot(year, sex)
 
 # Metrics
 c1, c2, c3 = st.columns(3)
@@ -57,27 +322,7 @@ st.dataframe(df.sample(20, random_state=42), use_container_width=True)
 st.subheader("Trend over time (global average)")
 
 # Глобальний тренд по роках для вибраної статі (Both sexes / Male / Female)
-df_trend = (
-    df_raw[df_raw["Dim1"] == sex]
-    .groupby("Period")["FactValueNumeric"]
-    .mean()
-    .reset_index()
-    .rename(columns={
-        "Period": "year",
-        "FactValueNumeric": "avg_insufficient_activity"
-    })
-    .dropna()
-)
-
-df_trend["avg_sufficient_activity"] = 100 - df_trend["avg_insufficient_activity"]
-
-fig = plt.figure(figsize=(10, 4))
-plt.plot(df_trend["year"], df_trend["avg_sufficient_activity"], marker="o")
-plt.xlabel("Year")
-plt.ylabel("Avg sufficient physical activity (%)")
-plt.title("Global trend in physical activity over time")
-st.pyplot(fig)
-plt.close(fig)
+st.image(trend_png(sex), width="stretch")
 
 st.caption(
     "This line chart shows how the global average level of physical activity changes over time. "
@@ -88,14 +333,11 @@ st.caption(
 st.subheader("Distribution")
 colA, colB = st.columns(2)
 
+vals_suf = df["sufficient_activity"].to_numpy()
+vals_bytes = vals_suf.tobytes()
+
 with colA:
-    fig = plt.figure(figsize=(8, 5))
-    plt.hist(df["sufficient_activity"], bins=20)
-    plt.xlabel("Sufficient physical activity (%)")
-    plt.ylabel("Number of countries")
-    plt.title("Histogram")
-    st.pyplot(fig)
-    plt.close(fig)
+    st.image(hist_png(vals_bytes), width="stretch")
 st.caption(
     "Most countries have a sufficient physical activity level between 60% and 85%. "
     "However, a noticeable group of countries falls below this range, indicating "
@@ -103,12 +345,7 @@ st.caption(
 )
 
 with colB:
-    fig = plt.figure(figsize=(8, 3))
-    sns.boxplot(x=df["sufficient_activity"])
-    plt.xlabel("Sufficient physical activity (%)")
-    plt.title("Boxplot")
-    st.pyplot(fig)
-    plt.close(fig)
+    st.image(boxplot_png(vals_bytes), width="stretch")
 st.caption(
     "The boxplot shows a relatively compact distribution of physical activity levels. "
     "Only a few countries exhibit very low activity levels, while extreme high values "
@@ -117,25 +354,20 @@ st.caption(
 st.subheader("Clustering: groups of countries by activity level")
 
 # Кластеризацію робимо на snapshot df (обраний year + sex)
-X = df[["sufficient_activity"]].copy()
-
-scaler = StandardScaler()
-X_scaled = scaler.fit_transform(X)
-
 k = st.slider("Number of clusters (k)", min_value=2, max_value=6, value=3)
 
-kmeans = KMeans(n_clusters=k, random_state=42, n_init=10)
-df["cluster"] = kmeans.fit_predict(X_scaled)
+labels = cluster_labels(year, sex, k)
+_, centers = fit_kmeans(vals_bytes, k)
 st.markdown("### Countries in each cluster")
 
 # 1) Вибір кластера
 selected_cluster = st.selectbox(
     "Select cluster to view countries",
-    sorted(df["cluster"].unique())
+    np.unique(labels).tolist()
 )
 
 cluster_df = (
-    df[df["cluster"] == selected_cluster]
+    df.iloc[labels == selected_cluster]
     .sort_values("sufficient_activity", ascending=False)
     .reset_index(drop=True)
 )
@@ -150,30 +382,34 @@ st.dataframe(
 
 # 3) Пошук конкретної країни і показ її кластера
 st.markdown("### Find a country")
-country_search = st.selectbox("Choose a country", sorted(df["country"].unique()))
-row = df[df["country"] == country_search].iloc[0]
+country_search = st.selectbox("Choose a country", country_options(year, sex))
+i = country_index(year, sex)[country_search]
+# Беремо звичайні float-и з numpy-масиву замість індексації Series через рядок
+insuf = float(df["insufficient_activity"].to_numpy()[i])
+suf = 100.0 - insuf
 
 st.info(
-    f"**{country_search}** → **cluster {int(row['cluster'])}**, "
-    f"**{row['sufficient_activity']:.1f}%** sufficient activity "
-    f"({row['insufficient_activity']:.1f}% insufficient)."
+    f"**{country_search}** → **cluster {int(labels[i])}**, "
+    f"**{suf:.1f}%** sufficient activity "
+    f"({insuf:.1f}% insufficient)."
 )
 
 # 4) Top/Bottom всередині кластера — дуже корисно і не перевантажує
 top_n = st.slider("Show top/bottom N within selected cluster", 5, 30, 10)
 
+# cluster_df вже відсортований за спаданням, тож top/bottom — це просто зрізи
 col1, col2 = st.columns(2)
 with col1:
     st.write("Top countries in this cluster")
     st.dataframe(
-        cluster_df.nlargest(top_n, "sufficient_activity")[["country", "sufficient_activity"]],
+        cluster_df.iloc[:top_n][["country", "sufficient_activity"]],
         use_container_width=True
     )
 
 with col2:
     st.write("Bottom countries in this cluster")
     st.dataframe(
-        cluster_df.nsmallest(top_n, "sufficient_activity")[["country", "sufficient_activity"]],
+        cluster_df.iloc[::-1].iloc[:top_n][["country", "sufficient_activity"]],
         use_container_width=True
     )
 
@@ -183,8 +419,8 @@ st.caption(
 )
 
 # Скільки країн у кожному кластері
-cluster_counts = df["cluster"].value_counts().sort_index().reset_index()
-cluster_counts.columns = ["cluster", "countries"]
+cluster_counts = pd.DataFrame({"cluster": range(k), "countries": np.bincount(labels, minlength=k)})
+cluster_counts = cluster_counts[cluster_counts["countries"] > 0]
 
 c1, c2 = st.columns(2)
 with c1:
@@ -192,21 +428,12 @@ with c1:
     st.dataframe(cluster_counts, use_container_width=True)
 
 with c2:
-    # Центри кластерів у вихідних % (повертаємо scale назад)
-    centers_scaled = kmeans.cluster_centers_
-    centers = scaler.inverse_transform(centers_scaled).flatten()
     centers_df = pd.DataFrame({"cluster": range(k), "center_sufficient_activity": centers}).sort_values("center_sufficient_activity")
     st.write("Cluster centers (sufficient activity %)")
     st.dataframe(centers_df, use_container_width=True)
 
 # Візуалізація: stripplot по кластерах (наочніше для 1 фічі)
-fig = plt.figure(figsize=(10, 4))
-sns.stripplot(data=df, x="cluster", y="sufficient_activity", jitter=0.25)
-plt.xlabel("Cluster")
-plt.ylabel("Sufficient physical activity (%)")
-plt.title("Clusters of countries by physical activity level")
-st.pyplot(fig)
-plt.close(fig)
+st.image(stripplot_png(labels.tobytes(), vals_bytes), width="stretch")
 
 st.caption(
     "Clustering groups countries with similar physical activity levels. "
@@ -216,30 +443,7 @@ st.caption(
 st.subheader("Heatmap: Activity by Region and Year")
 
 if "ParentLocation" in df_raw.columns:
-    # беремо Both sexes для стабільності порівняння
-    heat_df = (
-        df_raw[df_raw["Dim1"] == "Both sexes"]
-        .groupby(["ParentLocation", "Period"])["FactValueNumeric"]
-        .mean()
-        .reset_index()
-        .rename(columns={
-            "ParentLocation": "region",
-            "Period": "year",
-            "FactValueNumeric": "avg_insufficient_activity"
-        })
-    )
-
-    heat_df["avg_sufficient_activity"] = 100 - heat_df["avg_insufficient_activity"]
-
-    pivot = heat_df.pivot(index="region", columns="year", values="avg_sufficient_activity")
-
-    fig = plt.figure(figsize=(12, 4))
-    sns.heatmap(pivot, annot=False)
-    plt.xlabel("Year")
-    plt.ylabel("Region")
-    plt.title("Average sufficient physical activity (%) by region and year")
-    st.pyplot(fig)
-    plt.close(fig)
+    st.image(heatmap_png(), width="stretch")
 
     st.caption(
         "This heatmap shows how average physical activity levels vary across regions over time. "
@@ -256,31 +460,18 @@ st.markdown(
     "physical activity, helping identify extreme cases rather than statistical outliers."
 )
 
+# Мітки додаємо до копії для показу — кешований snapshot лишається незмінним
+top10, bottom10 = top_bottom(df.assign(cluster=labels), 10)
+
 colC, colD = st.columns(2)
 with colC:
     st.write("Bottom 10 (lowest sufficient activity)")
-    st.dataframe(df.nsmallest(10, "sufficient_activity"), use_container_width=True)
+    st.dataframe(bottom10, use_container_width=True)
 with colD:
     st.write("Top 10 (highest sufficient activity)")
-    st.dataframe(df.nlargest(10, "sufficient_activity"), use_container_width=True)
+    st.dataframe(top10, use_container_width=True)
 
 # Region breakdown (optional)
 if "ParentLocation" in df_raw.columns:
     st.subheader("By Region (Both sexes)")
-    df_region = (
-        df_raw[(df_raw["Period"] == year) & (df_raw["Dim1"] == "Both sexes")]
-        .groupby("ParentLocation")["FactValueNumeric"]
-        .mean()
-        .reset_index()
-        .rename(columns={"ParentLocation": "region", "FactValueNumeric": "avg_insufficient_activity"})
-        .dropna()
-    )
-    df_region["avg_sufficient_activity"] = 100 - df_region["avg_insufficient_activity"]
-
-    fig = plt.figure(figsize=(8, 5))
-    sns.barplot(data=df_region, x="avg_sufficient_activity", y="region")
-    plt.xlabel("Avg sufficient activity (%)")
-    plt.ylabel("Region")
-    plt.title("Average sufficient activity by region")
-    st.pyplot(fig)
-    plt.close(fig)
+    st.image(region_bar_png(year), width="stretch")